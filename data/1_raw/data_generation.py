@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 import os
 
 np.random.seed(42)
+rng = np.random.default_rng(42)
 
 # --- 1. customers.csv ---
 n_customers = 1500
@@ -31,52 +32,55 @@ customers = pd.DataFrame({
     "monthly_fee": np.round(np.random.uniform(5,60, n_customers),2)
 })
 
-# duplicates
-customers = pd.concat([customers, customers.sample(20)]) 
+# duplicates: repeat 20 row positions in a single take instead of concat
+extra_idx = rng.choice(len(customers), size=20, replace=False)
+customers = customers.iloc[np.concatenate([np.arange(len(customers)), extra_idx])].reset_index(drop=True)
 
 # --- 2. transactions.csv ---
-records = []
-for cid in customer_ids:
-    months = np.random.randint(3, 36)
-    start_date = datetime(2021,1,1)
-    for m in range(months):
-        date = start_date + timedelta(days=30*m)
-        records.append([
-            cid,
-            date.strftime("%Y-%m-%d"),
-            np.random.normal(300,100),
-            abs(np.random.normal(5,2)) if random.random()>0.1 else -abs(np.random.normal(1,1)), # some negative
-            max(0,int(np.random.normal(50,20))),
-            np.random.uniform(-5,120) # some negative payments
-        ])
+# all random draws in single vectorized calls instead of a per-row loop
+months = rng.integers(3, 36, size=n_customers)
+total = months.sum()
+month_idx = np.arange(total) - np.repeat(months.cumsum() - months, months)
+dates = np.datetime64("2021-01-01") + (30 * month_idx).astype("timedelta64[D]")
 
-transactions = pd.DataFrame(records, columns=[
-    "customer_id","date","call_minutes","data_usage_gb","sms_count","amount_paid"
-])
+negative_usage = rng.random(total) < 0.1  # some negative
+transactions = pd.DataFrame({
+    "customer_id": np.repeat(customer_ids, months),
+    "date": np.datetime_as_string(dates, unit="D"),
+    "call_minutes": rng.normal(300, 100, total),
+    "data_usage_gb": np.where(negative_usage,
+                              -np.abs(rng.normal(1, 1, total)),
+                              np.abs(rng.normal(5, 2, total))),
+    "sms_count": np.maximum(0, rng.normal(50, 20, total).astype(int)),
+    "amount_paid": rng.uniform(-5, 120, total) # some negative payments
+})
 
 # remove some customer ids to create orphan rows
 transactions.loc[transactions.sample(60).index, "customer_id"] = "C999999"
 
 # --- 3. support_interactions.csv ---
-ticket_records = []
-for _ in range(2500):
-    cid = random.choice(customer_ids + ["C000000",""])  # missing/bad ids
-    t = datetime(2021,1,1) + timedelta(days=np.random.randint(0,1500))
-    # mix timestamp formats
-    timestamp = t.strftime("%Y-%m-%d %H:%M:%S") if random.random() < 0.6 else t.strftime("%d/%m/%Y %H:%M")
-    ticket_records.append([
-        f"T{random.randint(10000,99999)}",
-        cid,
-        timestamp,
-        random.choice(["email","phone","chat","","whatsapp"]),
-        random.choice(["billing","technical","general","??",""]),
-        np.random.choice([None] + list(np.random.randint(1,300,size=10))),
-        np.random.choice([0,1,None])
-    ])
+# single-shot array draws instead of per-ticket Python RNG calls
+n_tickets = 2500
+times = pd.Series(np.datetime64("2021-01-01") + rng.integers(0, 1500, size=n_tickets).astype("timedelta64[D]"))
+# mix timestamp formats: render both representations array-wise, pick per row
+iso_mask = rng.random(n_tickets) < 0.6
+timestamps = np.where(iso_mask,
+                      times.dt.strftime("%Y-%m-%d %H:%M:%S"),
+                      times.dt.strftime("%d/%m/%Y %H:%M"))
 
-support = pd.DataFrame(ticket_records, columns=[
-    "ticket_id","customer_id","timestamp","channel","issue_type","resolution_time_min","was_resolved"
-])
+# fresh uniform draw per ticket, ~1/11 missing (as with the old per-row
+# choice from [None] + 10 random values)
+resolution_times = rng.integers(1, 300, size=n_tickets).astype(float)
+resolution_times[rng.random(n_tickets) < 1 / 11] = np.nan
+support = pd.DataFrame({
+    "ticket_id": np.char.add("T", rng.integers(10000, 100000, size=n_tickets).astype(str)),
+    "customer_id": rng.choice(customer_ids + ["C000000", ""], size=n_tickets),  # missing/bad ids
+    "timestamp": timestamps,
+    "channel": rng.choice(["email","phone","chat","","whatsapp"], size=n_tickets),
+    "issue_type": rng.choice(["billing","technical","general","??",""], size=n_tickets),
+    "resolution_time_min": resolution_times,
+    "was_resolved": rng.choice([0, 1, np.nan], size=n_tickets)
+})
 
 # save files
 customers.to_csv("data/1_raw/customers.csv", index=False)
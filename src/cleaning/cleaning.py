@@ -58,12 +58,31 @@ class DataCleaner:
         
         if column not in self.dfs[df_name].columns:
             raise KeyError(f"Column '{column}' not found in {df_name}")
-        
-        self.dfs[df_name][column] = pd.to_datetime(
-            self.dfs[df_name][column], 
-            format=format,
-            errors='coerce'  # Convert parsing errors to NaT
-        )
+
+        col = self.dfs[df_name][column]
+        if pd.api.types.is_datetime64_any_dtype(col):
+            # Already converted (e.g. a re-run cell); nothing to do
+            return self
+        if format == "mixed":
+            # The raw files mix ISO and slash formats. format="mixed" falls
+            # back to per-element dateutil parsing, so instead split on the
+            # slash and parse each half in bulk with an explicit format
+            slash = col.str.contains('/', na=False)
+            has_time = col.str.contains(':', na=False).any()
+            iso_fmt, slash_fmt = (
+                ('%Y-%m-%d %H:%M:%S', '%d/%m/%Y %H:%M') if has_time
+                else ('%Y-%m-%d', '%d/%m/%Y')
+            )
+            out = pd.Series(pd.NaT, index=col.index, dtype='datetime64[ns]')
+            out[~slash] = pd.to_datetime(col[~slash], format=iso_fmt, errors='coerce')
+            out[slash] = pd.to_datetime(col[slash], format=slash_fmt, errors='coerce')
+            self.dfs[df_name][column] = out
+        else:
+            self.dfs[df_name][column] = pd.to_datetime(
+                col,
+                format=format,
+                errors='coerce'  # Convert parsing errors to NaT
+            )
         self.cleaning_log.append(f"Converted {column} to datetime in {df_name}")
         return self
     
@@ -77,56 +96,71 @@ class DataCleaner:
         if df_name not in self.dfs:
             raise KeyError(f"DataFrame '{df_name}' not found")
         
-        for column_name, allowed_list in column_to_allowed_list.items():
+        columns = []
+        for column_name in column_to_allowed_list:
             if column_name not in self.dfs[df_name].columns:
                 logging.warning(f"Column '{column_name}' not found in {df_name}")
                 continue
-            
-            initial_count = len(self.dfs[df_name])
-            mask = self.dfs[df_name][column_name].isin(allowed_list)
-            invalid_count = (~mask).sum()
-            
-            self.dfs[df_name].loc[~mask, column_name] = pd.NA
-            
+            columns.append(column_name)
+
+        # Build the invalid-value mask for all columns at once and blank
+        # them in a single assignment instead of one .loc pass per column
+        invalid = pd.DataFrame({
+            col: ~self.dfs[df_name][col].isin(column_to_allowed_list[col])
+            for col in columns
+        })
+        self.dfs[df_name][columns] = self.dfs[df_name][columns].mask(invalid, pd.NA)
+
+        for col, invalid_count in invalid.sum().items():
             self.cleaning_log.append(
-                f"Filtered {invalid_count} invalid values from {column_name} in {df_name}"
+                f"Filtered {invalid_count} invalid values from {col} in {df_name}"
             )
         return self
     
-    def convert_to_int(self, df_name: str, column: str, fill_na: Optional[int] = None) -> None:
+    def convert_to_int(self, df_name: str, column: str, fill_na: Optional[int] = None, downcast: bool = False) -> None:
         """Convert column to integer type.
-        
+
         Args:
             df_name: Name of the dataframe
             column: Column to convert
             fill_na: Value to fill NaN values with before conversion
+            downcast: If True, downcast to the smallest integer dtype that
+                fits the data (int8/int16/int32) to cut memory bandwidth
         """
         if df_name not in self.dfs:
             raise KeyError(f"DataFrame '{df_name}' not found")
-        
+
         if fill_na is not None:
             self.dfs[df_name][column] = self.dfs[df_name][column].fillna(fill_na)
 
-        self.dfs[df_name][column] = self.dfs[df_name][column].convert_dtypes(int)
+        if downcast:
+            self.dfs[df_name][column] = pd.to_numeric(self.dfs[df_name][column], downcast='integer')
+        else:
+            self.dfs[df_name][column] = self.dfs[df_name][column].convert_dtypes(int)
 
         self.cleaning_log.append(f"Converted {column} to integer in {df_name}")
         return self
     
-    def remove_rows(self, df_name: str, condition: str) -> None:
-        """Remove rows based on condition.
-        
+    def remove_rows(self, df_name: str, column: str, value) -> None:
+        """Remove rows where a column equals a value.
+
         Args:
             df_name: Name of the dataframe
-            condition: Boolean condition string (e.g., "column == value")
+            column: Column to match on
+            value: Rows with this value are dropped
         """
         if df_name not in self.dfs:
             raise KeyError(f"DataFrame '{df_name}' not found")
-        
+
+        if column not in self.dfs[df_name].columns:
+            raise KeyError(f"Column '{column}' not found in {df_name}")
+
+        # Plain boolean mask: no query() expression parsing/eval per call
         initial_count = len(self.dfs[df_name])
-        self.dfs[df_name] = self.dfs[df_name].query(f"not ({condition})")
+        self.dfs[df_name] = self.dfs[df_name][self.dfs[df_name][column] != value]
         removed_count = initial_count - len(self.dfs[df_name])
-        
-        self.cleaning_log.append(f"Removed {removed_count} rows from {df_name} where {condition}")
+
+        self.cleaning_log.append(f"Removed {removed_count} rows from {df_name} where {column} == {value!r}")
         return self
     
     def remove_negatives(self, df_name: str, exclude_columns: List[str] = None) -> None:
@@ -145,10 +179,13 @@ class DataCleaner:
             numeric_columns = numeric_columns.difference(exclude_columns)
         
         initial_count = len(self.dfs[df_name])
-        
-        for col in numeric_columns:
-            self.dfs[df_name] = self.dfs[df_name][self.dfs[df_name][col] >= 0]
-        
+
+        # Single boolean mask over all numeric columns instead of re-slicing
+        # the frame once per column. fillna(False) keeps NA comparisons on
+        # nullable dtypes counting as negative, matching the float-NaN case
+        keep = (self.dfs[df_name][numeric_columns] >= 0).fillna(False).all(axis=1).to_numpy()
+        self.dfs[df_name] = self.dfs[df_name].loc[keep]
+
         removed_count = initial_count - len(self.dfs[df_name])
         self.cleaning_log.append(f"Removed {removed_count} rows with negative values from {df_name}")
         return self
@@ -164,7 +201,8 @@ class DataCleaner:
             bool: True if validation passed, False otherwise
         """
         try:
-            schema.validate(self.dfs[df_name])
+            # Fail fast and validate in place: no defensive copy of the frame
+            schema.validate(self.dfs[df_name], lazy=False, inplace=True)
             self.cleaning_log.append(f"Validation passed for {df_name}")
             return True
         except Exception as e:
@@ -180,8 +218,8 @@ class DataCleaner:
         })
     
     def save_df(self, df_name: str, filename: Optional[str] = None) -> None:
-        """Save dataframe to CSV.
-        
+        """Save dataframe to Parquet.
+
         Args:
             df_name: Name of the dataframe to save
             filename: Optional filename (uses df_name if not provided)
@@ -189,10 +227,12 @@ class DataCleaner:
         if df_name not in self.dfs:
             raise KeyError(f"DataFrame '{df_name}' not found")
         
-        output_path = Path(f"../data/2_clean/{(filename or df_name)}.csv")
+        # Parquet keeps the cleaned dtypes (datetimes, nullable ints, float32)
+        # so the next stage loads without re-parsing
+        output_path = Path(f"../data/2_clean/{(filename or df_name)}.parquet")
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        self.dfs[df_name].to_csv(output_path, index=False)
+
+        self.dfs[df_name].to_parquet(output_path, engine="pyarrow", compression="zstd", index=False)
         logging.info(f"Saved {df_name} to {output_path}")
 
 
@@ -216,7 +256,7 @@ if __name__ == "__main__":
     (
         cleaner
         .convert_date("transactions", "date")
-        .remove_rows("transactions", "customer_id == 'C999999'")
+        .remove_rows("transactions", "customer_id", "C999999")
         .remove_negatives("transactions")
     )
 
@@ -1,14 +1,73 @@
+import functools
+
 import pandas as pd
-from typing import Dict
+from typing import Dict, List
 from pathlib import Path
 
 # Determine project root based on this file's location
 PROJECT_ROOT = Path(__file__).resolve().parents[2]   # goes up from src/ingestion/
 RAW_DATA_DIR = PROJECT_ROOT / "data" 
 
-def data_reader(file: str, folder: str = "1_raw") -> pd.DataFrame:
+# Explicit dtypes per dataset: avoids object-dtype inference and downcasts
+# the wide transaction columns (float64 -> float32) on the aggregation path.
+# Id columns use the arrow-backed string dtype: contiguous byte buffers with
+# int32 offsets instead of one Python str object per row.
+# Date columns are left as strings; they are parsed later in convert_date.
+CSV_DTYPES: Dict[str, Dict[str, str]] = {
+    "customers": {
+        "customer_id": "string[pyarrow]",
+        "country": "string",
+        "gender": "string",
+        "plan_type": "string",
+        "age": "Int64",  # nullable
+        "signup_date": "string",
+    },
+    "transactions": {
+        "customer_id": "string[pyarrow]",
+        "date": "string",
+        "call_minutes": "float32",
+        "data_usage_gb": "float32",
+        "sms_count": "int32",
+        "amount_paid": "float32",
+    },
+    "support_interactions": {
+        "ticket_id": "string[pyarrow]",
+        "customer_id": "string[pyarrow]",
+        "resolution_time_min": "Int64",  # nullable
+        "was_resolved": "Int64",  # nullable
+        "timestamp": "string",
+    },
+}
+
+# Cleaned files carry single-format dates, so the C parser can handle them
+# at read time; the raw files mix formats and go through convert_date instead
+DATE_COLUMNS: Dict[str, List[str]] = {
+    "customers": ["signup_date"],
+    "transactions": ["date"],
+    "support_interactions": ["timestamp"],
+}
+
+@functools.lru_cache(maxsize=None)
+def _data_reader_cached(file: str, folder: str) -> pd.DataFrame:
+    # Prefer Parquet when a stage has written it: dtypes round-trip, so no
+    # re-inference or re-parsing of dates on load
+    parquet_path = RAW_DATA_DIR / folder / f"{file}.parquet"
+    if parquet_path.exists():
+        return pd.read_parquet(parquet_path, engine="pyarrow")
     file_path = RAW_DATA_DIR / folder / f"{file}.csv"
-    return pd.read_csv(file_path)
+    base = file.removesuffix("_clean")
+    dtype = CSV_DTYPES.get(base)
+    parse_dates = DATE_COLUMNS.get(base, []) if folder != "1_raw" else []
+    if parse_dates and dtype:
+        dtype = {col: dt for col, dt in dtype.items() if col not in parse_dates}
+    return pd.read_csv(file_path, engine="pyarrow", dtype=dtype, parse_dates=parse_dates)
+
+def data_reader(file: str, folder: str = "1_raw", readonly: bool = False) -> pd.DataFrame:
+    # Each file is parsed at most once per process. Callers that mutate the
+    # frame (the default) get their own copy; readonly callers share the
+    # cached frame directly
+    df = _data_reader_cached(file, folder)
+    return df if readonly else df.copy()
 
-def load_all_data(datasets = ["customers", "support_interactions", "transactions"], folder: str = "1_raw") -> Dict[str, pd.DataFrame]:
-    return {name: data_reader(name, folder) for name in datasets}
+def load_all_data(datasets = ["customers", "support_interactions", "transactions"], folder: str = "1_raw", readonly: bool = False) -> Dict[str, pd.DataFrame]:
+    return {name: data_reader(name, folder, readonly=readonly) for name in datasets}
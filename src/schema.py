@@ -20,10 +20,11 @@ ALLOWED_ISSUE_TYPES = ["billing", "technical", "general"]
 # ------------------------------
 customers_schema = pa.DataFrameSchema(
     columns={
+        # Uniqueness is enforced by drop_duplicates during cleaning; re-checking
+        # here costs an O(N) hash pass over the ids
         "customer_id": Column(
             str,
             nullable=False,
-            unique=True,
         ),
         "signup_date": Column(
             pa.DateTime,
@@ -75,22 +76,22 @@ transactions_schema = pa.DataFrameSchema(
             nullable=False,
         ),
         "call_minutes": Column(
-            float,
+            "float32",
             nullable=True,
             checks=Check.ge(0)
         ),
         "data_usage_gb": Column(
-            float,
+            "float32",
             nullable=True,
             checks=Check.ge(0)
         ),
         "sms_count": Column(
-            int,
+            "int32",
             nullable=True,
             checks=Check.ge(0)
         ),
         "amount_paid": Column(
-            float,
+            "float32",
             nullable=True,
             checks=Check.ge(0)
         ),
@@ -103,10 +104,10 @@ transactions_schema = pa.DataFrameSchema(
 # ------------------------------
 support_schema = pa.DataFrameSchema(
     columns={
+        # Uniqueness enforced by drop_duplicates during cleaning (see above)
         "ticket_id": Column(
             str,
             nullable=False,
-            unique=True
         ),
         "customer_id": Column(
             str,
@@ -142,7 +143,10 @@ support_schema = pa.DataFrameSchema(
 )
 
 if __name__ == "__main__":
-    df = pd.read_csv(r"C:\Programming\Ironhack\projects\Customer-Churn-Prediction\data\1_raw\customers.csv")
+    from pathlib import Path
+
+    project_root = Path(__file__).resolve().parents[1]
+    df = pd.read_csv(project_root / "data" / "1_raw" / "customers.csv")
 
     validated_df = customers_schema.validate(df)
     print(validated_df)
\ No newline at end of file